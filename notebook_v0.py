@@ -9,12 +9,21 @@ starter code for your evaluation assignment
 import base64
 import io
 import json
+import math
 import pprint
+import re
 from pathlib import Path
 
 # Third-Party Libraries
 import numpy as np
 import PIL.Image  # pillow
+
+try:
+    import orjson  # plus rapide que json pour les gros notebooks, optionnel
+except ImportError:
+    orjson = None
+
+_LONG_DIGITS = re.compile(rb'\d{19}') # suite de chiffres qui peut dépasser un entier 64 bits
 #Path =  '/Users/utilisateur/.vscode/extensions/ms-python.python-2021.12.1559732655/pythonFiles/lib/python/debugpy/launcher 55717 -- /Users/utilisateur/Documents/GitHub/python-advanced-evaluation-groupe5/'
 
 
@@ -52,8 +61,15 @@ def load_ipynb(filename):
          'nbformat': 4,
          'nbformat_minor': 5}
     """
-    f = open(filename)
-    json_file = json.load(f)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    # orjson lit les entiers de plus de 64 bits comme des float : dans ce cas on passe par json
+    if orjson is not None and _LONG_DIGITS.search(data) is None:
+        try:
+            return(orjson.loads(data))
+        except orjson.JSONDecodeError: # NaN, Infinity... refusés par orjson mais acceptés par json
+            pass
+    json_file = json.loads(data)
     return(json_file)
 
 def save_ipynb(ipynb, filename):
@@ -77,8 +93,44 @@ def save_ipynb(ipynb, filename):
 
     """
 
-    f = open(filename,'w')
-    return(json.dump(ipynb,f))
+    with open(filename, 'wb') as f:
+        f.write(dumps_ipynb(ipynb))
+
+
+def dumps_ipynb(ipynb):
+    r"""
+    Encode a jupyter notebook (Python dict), or any part of it, as JSON (bytes).
+
+    Uses orjson when it is installed, the standard json module otherwise.
+
+    Usage:
+
+        >>> dumps_ipynb({'cells': [], 'metadata': {}}) in (b'{"cells":[],"metadata":{}}', b'{"cells": [], "metadata": {}}')
+        True
+    """
+    # orjson écrirait NaN et Infinity sous la forme null : dans ce cas on passe par json
+    if orjson is not None and not _has_non_finite(ipynb):
+        try:
+            return(orjson.dumps(ipynb, option=orjson.OPT_NON_STR_KEYS))
+        except (orjson.JSONEncodeError, TypeError): # entiers de plus de 64 bits, types inconnus...
+            pass
+    return(json.dumps(ipynb).encode('utf-8'))
+
+
+def _has_non_finite(obj):
+    '''indique si obj (dict, liste...) contient un float NaN ou infini'''
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, float):
+            if not math.isfinite(x):
+                return(True)
+        elif isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+    return(False)
 
 
 def get_format_version(ipynb):
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import math
 import os
 import unittest
+from unittest import mock
 import numpy as np
 
+import notebook_v0
 from notebook_v0 import *
 
 def strip_last_lines(s):
@@ -90,6 +93,44 @@ class Question1(unittest.TestCase):
         finally:
             os.remove("samples/hello-world-save-load.ipynb")
 
+    def test_save_load_ipynb_without_orjson(self):
+        ipynb = load_ipynb("samples/hello-world.ipynb")
+        with mock.patch.object(notebook_v0, "orjson", None):
+            save_ipynb(ipynb, "samples/hello-world-save-load.ipynb")
+            try:
+                self.assertEqual(ipynb, load_ipynb("samples/hello-world-save-load.ipynb"))
+            finally:
+                os.remove("samples/hello-world-save-load.ipynb")
+
+    def test_load_ipynb_nan(self):
+        with open("samples/nan-save-load.ipynb", "w", encoding="utf-8") as f:
+            f.write('{"cells": [], "metadata": {"x": NaN}, "nbformat": 4, "nbformat_minor": 5}')
+        try:
+            ipynb = load_ipynb("samples/nan-save-load.ipynb")
+            self.assertTrue(math.isnan(ipynb["metadata"]["x"]))
+        finally:
+            os.remove("samples/nan-save-load.ipynb")
+
+    def test_save_load_ipynb_big_int(self):
+        ipynb = {"cells": [], "metadata": {"x": 2**70, "y": -2**70}, "nbformat": 4, "nbformat_minor": 5}
+        save_ipynb(ipynb, "samples/big-int-save-load.ipynb")
+        try:
+            ipynb_saved = load_ipynb("samples/big-int-save-load.ipynb")
+            self.assertEqual(ipynb, ipynb_saved)
+            self.assertIsInstance(ipynb_saved["metadata"]["x"], int)
+        finally:
+            os.remove("samples/big-int-save-load.ipynb")
+
+    def test_save_load_ipynb_nan(self):
+        ipynb = {"cells": [], "metadata": {"x": float("nan"), "y": [float("inf")]}, "nbformat": 4, "nbformat_minor": 5}
+        save_ipynb(ipynb, "samples/nan-save-load.ipynb")
+        try:
+            ipynb_saved = load_ipynb("samples/nan-save-load.ipynb")
+            self.assertTrue(math.isnan(ipynb_saved["metadata"]["x"]))
+            self.assertEqual([float("inf")], ipynb_saved["metadata"]["y"])
+        finally:
+            os.remove("samples/nan-save-load.ipynb")
+
 class Question2(unittest.TestCase):
     def test_get_format_version_minimal(self):
         ipynb = load_ipynb("samples/minimal.ipynb")
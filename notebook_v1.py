@@ -4,32 +4,43 @@
 """
 an object-oriented version of the notebook toolbox
 """
-from json import load
-from notebook_v0 import *
+import os
+import pprint
+from functools import lru_cache
+from notebook_v0 import dumps_ipynb, get_cells, get_format_version, load_ipynb, to_percent
 
 # définition de deux fonctions perso dont je me sers plus tard
 
 def clean_cells(ipynb):
     '''enlève metadata et outputs, renvoie liste des cells'''
-    cells = get_cells(ipynb)
     C = []
-    for cell in cells:
-        clean = dict()
-        for key in cell.keys():
-            if key != 'metadata' and key!='outputs':
-                clean[key]=cell[key]
-        C.append(clean)
+    app = C.append
+    for cell in get_cells(ipynb):
+        clean = dict(cell) # copie faite en C, puis on retire seulement les deux clés inutiles
+        clean.pop('metadata', None)
+        clean.pop('outputs', None)
+        app(clean)
     return(C)
 
 def cells_conv(ipynb):
     '''convertit avec les classes crées'''
-    C = []
-    for cell in clean_cells(ipynb):
-        if cell['cell_type'] == 'markdown':
-            C.append(MarkdownCell(cell))
-        if cell['cell_type'] == 'code':
-            C.append(CodeCell(cell))
-    return(C)
+    get = _CELL_CTOR.get
+    # un seul passage, les constructeurs ne lisent que les clés utiles ; les types inconnus (raw, ...) sont ignorés
+    return([ctor(cell) for cell in get_cells(ipynb) if (ctor := get(cell['cell_type'])) is not None])
+
+_EMPTY = {} # metadata et outputs partagés, ne doivent jamais être modifiés
+_EMPTY_LIST = []
+
+def _cell_to_dict(cell, fresh=True):
+    '''reconstruit le dictionnaire d'une cellule, sans metadata ni outputs
+
+    si fresh est faux, metadata et outputs sont les conteneurs vides partagés :
+    à réserver aux dictionnaires qui ne sont que lus (to_percent, écriture JSON)'''
+    metadata, outputs = ({}, []) if fresh else (_EMPTY, _EMPTY_LIST)
+    if isinstance(cell, MarkdownCell):
+        return({'cell_type': 'markdown', 'id': cell.id, 'metadata': metadata, 'source': cell.source})
+    return({'cell_type': 'code', 'execution_count': cell.execution_count, 'id': cell.id,
+            'metadata': metadata, 'outputs': outputs, 'source': cell.source})
 
 
 
@@ -61,6 +72,8 @@ class CodeCell:
         ['print("Hello world!")']
     """
 
+    __slots__ = ('id', 'source', 'execution_count') # pas de __dict__ par instance
+
     def __init__(self, ipynb):
         self.id = ipynb["id"] # marche car ipynb est un dictionnaire
         self.source = ipynb['source']
@@ -94,11 +107,30 @@ class MarkdownCell:
         ['Hello world!\n', '============\n', 'Print `Hello world!`:']
     """
 
+    __slots__ = ('id', 'source') # pas de __dict__ par instance
+
     def __init__(self, ipynb):
         self.id = ipynb["id"]
         self.source = ipynb["source"]
 
 
+_CELL_CTOR = {'markdown': MarkdownCell, 'code': CodeCell} # constructeur à utiliser selon le type de cellule
+
+@lru_cache(maxsize=128)
+def _load_ipynb_cached(path, mtime_ns, size):
+    '''charge un .ipynb en gardant en mémoire les derniers fichiers lus, utilisé par Notebook.from_file
+
+    on ne garde que ce dont Notebook a besoin (ni outputs ni metadata), sous forme de tuples
+    non modifiables ; mtime_ns et size ne servent qu'à la clé du cache : si le fichier change, on le relit'''
+    ipynb = load_ipynb(path)
+    cells = tuple(
+        (cell['cell_type'], cell['id'],
+         cell['execution_count'] if cell['cell_type'] == 'code' else None,
+         cell['source'] if isinstance(cell['source'], str) else tuple(cell['source']))
+        for cell in get_cells(ipynb) if cell['cell_type'] in _CELL_CTOR)
+    return((ipynb['nbformat'], ipynb['nbformat_minor'], cells))
+
+
 class Notebook:
     r"""A Jupyter Notebook.
 
@@ -107,6 +139,8 @@ class Notebook:
 
     Attributes:
         version (str): the version of the notebook format.
+        nbformat (int): the major version of the notebook format.
+        nbformat_minor (int): the minor version of the notebook format.
         cells (list): a list of cells (either CodeCell or MarkdownCell).
 
     Usage:
@@ -128,21 +162,36 @@ class Notebook:
             True
     """
 
+    __slots__ = ('version', 'nbformat', 'nbformat_minor', 'cells') # pas de __dict__ par instance
+
     def __init__(self, ipynb):
         self.version = get_format_version(ipynb)
+        self.nbformat = ipynb['nbformat'] # déjà des entiers dans le JSON, inutile de redécouper la version
+        self.nbformat_minor = ipynb['nbformat_minor']
         self.cells = cells_conv(ipynb)
 
     @staticmethod
     def from_file(filename):
         r"""Loads a notebook from an .ipynb file.
 
+        The parsed file is cached (keyed on its absolute path, modification
+        time and size), so loading an unchanged file again skips reading and
+        parsing it. Each call still returns a new Notebook of its own.
+
         Usage:
 
             >>> nb = Notebook.from_file("samples/minimal.ipynb")
             >>> nb.version
             '4.5'
         """
-        return(Notebook(load_ipynb(filename))) # on charge puis on convertit 
+        path = os.path.abspath(filename)
+        st = os.stat(path)
+        nbformat, nbformat_minor, cells = _load_ipynb_cached(path, st.st_mtime_ns, st.st_size)
+        ipynb = {'nbformat': nbformat, 'nbformat_minor': nbformat_minor,
+                 'cells': [{'cell_type': t, 'id': id, 'execution_count': count,
+                            'source': list(source) if isinstance(source, tuple) else source} # nouvelle liste à chaque appel
+                           for t, id, count, source in cells]}
+        return(Notebook(ipynb)) # on convertit
 
     def __iter__(self):
         r"""Iterate the cells of the notebook.
@@ -181,39 +230,26 @@ class PyPercentSerializer:
     """
     def __init__(self, notebook):
         self.notebook = notebook
+        self._cache = None # (clé, résultat) du dernier appel à to_py_percent
 
     def to_py_percent(self):
         r"""Converts the notebook to a string in py-percent format.
         """
         nb0 = self.notebook
+        # le texte ne dépend que du type et du source des cellules : on en garde une copie
+        # comme clé, pour que toute modification des cellules invalide le cache
+        key = tuple((type(cell), tuple(cell.source)) for cell in nb0.cells)
+        if self._cache is not None and self._cache[0] == key: # rien n'a changé, on réutilise le résultat
+            return(self._cache[1])
         nb = dict() # dictionnaire qui contiendra le futur notebook
-        nb['cells'] = [] # liste qui contiendra les cellules
-
-        for cell in nb0.cells:
-            cell_new = dict() # dictionnaire qui contiendra les cellules
-            if type(cell) == MarkdownCell: # on reconstruit la cellule pas à pas
-                cell_new["cell_type"] = 'markdown'
-                cell_new["id"] = cell.id
-                cell_new['metadata'] = {}
-                cell_new["source"] = cell.source
-
-            else: # idem, mais avec les clés propres aux cellules de code
-                cell_new['cell_type'] = 'code'
-                cell_new["execution_count"] = cell.execution_count
-                cell_new["id"] = cell.id
-                cell_new['metadata'] = {}
-                cell_new['outputs'] = []
-                cell_new["source"] = cell.source
-            nb['cells'].append(cell_new) # on ajoute la cellule construire à la liste de cellules
+        nb['cells'] = [_cell_to_dict(cell, fresh=False) for cell in nb0.cells] # to_percent ne fait que lire les cellules
 
         nb['metadata'] = {}
-        v = nb0.version
-        v.split('.') # séparation des deux indicateurs de version
-        nb['nbformat'] = int(v[0])
-        nb['nbformat_minor'] = int(v[-1])
-        
-        
-        return(to_percent(nb))
+        nb['nbformat'] = nb0.nbformat
+        nb['nbformat_minor'] = nb0.nbformat_minor
+
+        self._cache = (key, to_percent(nb))
+        return(self._cache[1])
 
     def to_file(self, filename):
         r"""Serializes the notebook to a file
@@ -227,8 +263,8 @@ class PyPercentSerializer:
                 >>> s = PyPercentSerializer(nb)
                 >>> s.to_file("samples/hello-world-serialized-py-percent.py")
         """
-        ipynb = self.to_py_percent()
-        save_ipynb(ipynb, filename)
+        with open(filename, 'w', encoding='utf-8') as f: # on écrit directement le texte, pas besoin de passer par JSON
+            f.write(self.to_py_percent())
         
 class Serializer:
     r"""Serializes a Jupyter Notebook to a file.
@@ -260,7 +296,7 @@ class Serializer:
             'metadata': {},
             'nbformat': 4,
             'nbformat_minor': 5}
-        >>> s.to_file("samples/hello-world-serialized.ipynb")
+        >>> s.to_file("samples/hello-world-serialized-save-load.ipynb")
     """
 
     def __init__(self, notebook):
@@ -274,30 +310,11 @@ class Serializer:
         """
         nb0 = self.notebook
         nb = dict() # dictionnaire que l'on va remplir pas à pas
-        nb['cells'] = [] # future liste des cellules
-
-        for cell in nb0.cells: # on construit cellule par cellule, en fonction de leur type
-            cell_new = dict()
-            if type(cell) == MarkdownCell:
-                cell_new["cell_type"] = 'markdown'
-                cell_new["id"] = cell.id
-                cell_new['metadata'] = {}
-                cell_new["source"] = cell.source
-            else:
-                cell_new['cell_type'] = 'code'
-                cell_new["execution_count"] = cell.execution_count
-                cell_new["id"] = cell.id
-                cell_new['metadata'] = {}
-                cell_new['outputs'] = []
-                cell_new["source"] = cell.source
-            nb['cells'].append(cell_new)
+        nb['cells'] = [_cell_to_dict(cell) for cell in nb0.cells] # on construit cellule par cellule, en fonction de leur type
 
         nb['metadata'] = {}
-        v = nb0.version
-        v.split('.') # on sépare la version en ses deux composantes
-        nb['nbformat'] = int(v[0])
-        nb['nbformat_minor'] = int(v[-1])
-        
+        nb['nbformat'] = nb0.nbformat
+        nb['nbformat_minor'] = nb0.nbformat_minor
 
         return(nb)
 
@@ -311,15 +328,30 @@ class Serializer:
 
                 >>> nb = Notebook.from_file("samples/hello-world.ipynb")
                 >>> s = Serializer(nb)
-                >>> s.to_file("samples/hello-world-serialized.ipynb")
-                >>> nb = Notebook.from_file("samples/hello-world-serialized.ipynb")
+                >>> s.to_file("samples/hello-world-serialized-save-load.ipynb")
+                >>> nb = Notebook.from_file("samples/hello-world-serialized-save-load.ipynb")
                 >>> for cell in nb:
                 ...     print(cell.id)
                 a9541506
                 b777420a
                 a23ab5ac
         """
-        pass
+        nb0 = self.notebook
+        with open(filename, 'wb') as f: # on écrit les cellules une par une, sans construire le notebook entier
+            f.write(b'{"cells":[')
+            for i, cell in enumerate(nb0.cells):
+                if i:
+                    f.write(b',')
+                f.write(dumps_ipynb(_cell_to_dict(cell, fresh=False)))
+            f.write(b'],"metadata":{},"nbformat":%d,"nbformat_minor":%d}' % (nb0.nbformat, nb0.nbformat_minor))
+
+# gabarits des lignes de l'outline, selon la position de la ligne dans la cellule :
+# pas besoin de passer à la ligne sauf pour la dernière, le caractère \n est déjà
+# dans le code source pour toutes les lignes de la cellule sauf la dernière
+_MIDDLE_LINE = "    |  %s "    # ligne intermédiaire
+_FIRST_LINE = "    ┌  %s"      # première ligne dans le cas où il y en a plusieurs
+_LAST_LINE = "   └  %s \n"    # dernière ligne dans le cas où il y en a plusieurs
+_SINGLE_LINE = "    |  %s \n"  # unique ligne de la cellule
 
 class Outliner:
     r"""Quickly outlines the strucure of the notebook in a readable format.
@@ -351,38 +383,26 @@ class Outliner:
         Returns:
             str: a string representing the outline of the notebook.
         """
-        code_cell = CodeCell({"cell_type": "code","execution_count": 1,"id": "b777420a",'source': ['print("Hello world!")']}) 
-        #cellule de code utilisée plus tard 
-        
-        r = f"Jupyter notebook v{self.notebook.version}\n" # string dans laquelle on va construire l'objet retourné par la fonction
+        parts = [f"Jupyter notebook v{self.notebook.version}\n"] # morceaux de l'objet retourné, assemblés une seule fois à la fin
+        app = parts.append
+        middle = _MIDDLE_LINE # variable locale, plus rapide à lire dans la boucle qu'une globale
         for cell in self.notebook.cells:
 
-            if type(cell)==type(code_cell): # je n'ai pas trouvé comment faire ce test de type de façon plus jolie sans créer une cellule de code plus haut
-                t = 'Code Cell'
-            else :
-                t = 'Markdown Cell'
-            r = r + f"└─▶ {t} #{cell.id}\n"
+            t = 'Code Cell' if isinstance(cell, CodeCell) else 'Markdown Cell'
+            app(f"└─▶ {t} #{cell.id}\n")
             
             source = cell.source
             number_lines = len(source) # nombre de lignes de code
 
-            for k in range(number_lines): # on parcoure ligne par ligne 
-                current_line = source[k]
-
-                if k ==0 and number_lines !=1 : # première ligne dans le cas où il y en a plusieurs
-                    r = r + f"    ┌  {current_line}" # pas besoin de passer à la ligne, le caractère \n est déjà
-                    # dans le code source pour toutes les lignes de la cellule sauf la dernière
-
-                elif k==(number_lines-1) and number_lines !=1:
-                    r = r + f"   └  {current_line} " 
-
-                else : # ligne intermédiaire ou unique ligne de la cellule
-                     r = r + f"    |  {current_line} "
-
-                if k==(number_lines-1):#dernière ligne
-                    r = r + f"""\n""" # cette fois on doit ajouter le passage à la ligne
+            if number_lines == 1: # cas le plus courant, une seule ligne
+                app(_SINGLE_LINE % source[0])
+            elif number_lines > 1: # première ligne, lignes intermédiaires, dernière ligne
+                app(_FIRST_LINE % source[0])
+                for line in source[1:-1]:
+                    app(middle % line)
+                app(_LAST_LINE % source[-1])
         
-        return(r)
+        return("".join(parts))
 
 
 
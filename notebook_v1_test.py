@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
 import unittest
 
 from notebook_v1 import *
@@ -42,6 +43,12 @@ class Question9(unittest.TestCase):
         self.assertEqual("4.5", nb.version)
         self.assertIsInstance(nb.cells[0], MarkdownCell)
 
+    def test_build_notebook_skips_unknown_cells(self):
+        ipynb = toolbox.load_ipynb("samples/hello-world.ipynb")
+        ipynb["cells"].append({"cell_type": "raw", "id": "c0ffee00", "metadata": {}, "source": []})
+        nb = Notebook(ipynb)
+        self.assertEqual(["a9541506", "b777420a", "a23ab5ac"], [cell.id for cell in nb.cells])
+
 class Question9Bonus(unittest.TestCase):
     def test_build_notebook_hello_world(self):
         ipynb = toolbox.load_ipynb("samples/hello-world.ipynb")
@@ -55,6 +62,28 @@ class Question10(unittest.TestCase):
         nb = Notebook.from_file("samples/minimal.ipynb")
         self.assertEqual("4.5", nb.version)
 
+    def test_from_file_returns_independent_notebooks(self):
+        nb = Notebook.from_file("samples/hello-world.ipynb")
+        nb.cells.pop()
+        nb.cells[0].source.append("changed")
+        nb2 = Notebook.from_file("samples/hello-world.ipynb")
+        self.assertIsNot(nb, nb2)
+        self.assertEqual(3, len(nb2.cells))
+        self.assertNotIn("changed", nb2.cells[0].source)
+
+    def test_from_file_reloads_modified_file(self):
+        ipynb = toolbox.load_ipynb("samples/minimal.ipynb")
+        toolbox.save_ipynb(ipynb, "samples/minimal-save-load.ipynb")
+        try:
+            nb = Notebook.from_file("samples/minimal-save-load.ipynb")
+            self.assertEqual("4.5", nb.version)
+            ipynb["nbformat_minor"] = 10
+            toolbox.save_ipynb(ipynb, "samples/minimal-save-load.ipynb")
+            nb2 = Notebook.from_file("samples/minimal-save-load.ipynb")
+            self.assertEqual("4.10", nb2.version)
+        finally:
+            os.remove("samples/minimal-save-load.ipynb")
+
 class Question11(unittest.TestCase):
     def test_iter_dunder(self):
         nb = Notebook.from_file("samples/hello-world.ipynb")
@@ -88,6 +117,32 @@ class Question12(unittest.TestCase):
             'nbformat_minor': 5}
             , s.serialize())
 
+    def test_serializer_returns_fresh_dict(self):
+        nb = Notebook.from_file("samples/hello-world.ipynb")
+        s = Serializer(nb)
+        d = s.serialize()
+        d['metadata']['x'] = 1
+        d['cells'][0]['metadata']['y'] = 2
+        self.assertEqual({}, s.serialize()['metadata'])
+        self.assertEqual({}, s.serialize()['cells'][0]['metadata'])
+
+    def test_serializer_two_digit_minor_version(self):
+        ipynb = toolbox.load_ipynb("samples/minimal.ipynb")
+        ipynb["nbformat_minor"] = 10
+        s = Serializer(Notebook(ipynb))
+        self.assertEqual(4, s.serialize()['nbformat'])
+        self.assertEqual(10, s.serialize()['nbformat_minor'])
+
+    def test_serializer_to_file(self):
+        nb = Notebook.from_file("samples/hello-world.ipynb")
+        s = Serializer(nb)
+        s.to_file("samples/hello-world-save-load.ipynb")
+        try:
+            ipynb_saved = toolbox.load_ipynb("samples/hello-world-save-load.ipynb")
+            self.assertEqual(s.serialize(), ipynb_saved)
+        finally:
+            os.remove("samples/hello-world-save-load.ipynb")
+
 class Question13(unittest.TestCase):
     def test_py_percent_serializer(self):
             nb = Notebook.from_file("samples/hello-world.ipynb")
@@ -104,6 +159,15 @@ print("Hello world!")
 # Goodbye! 👋"""
             , strip_last_lines(ppp.to_py_percent()))
 
+    def test_py_percent_serializer_follows_cell_changes(self):
+            nb = Notebook(toolbox.load_ipynb("samples/hello-world.ipynb"))
+            ppp = PyPercentSerializer(nb)
+            self.assertIn("Goodbye!", ppp.to_py_percent())
+            nb.cells.pop()
+            self.assertNotIn("Goodbye!", ppp.to_py_percent())
+            nb.cells.clear()
+            self.assertEqual("", ppp.to_py_percent())
+
 class Question14(unittest.TestCase):
     def test_outliner(self):
             nb = Notebook.from_file("samples/hello-world.ipynb")
@@ -121,5 +185,23 @@ class Question14(unittest.TestCase):
             , strip_last_lines(o.outline())
             )
 
+    def test_outliner_line_layouts(self):
+        nb = Notebook({"nbformat": 4, "nbformat_minor": 5, "cells": [
+            {"cell_type": "code", "id": "c1", "execution_count": 2,
+             "source": ["x = 1\n", "y = 2\n", "print(x + y)"]},
+            {"cell_type": "markdown", "id": "m1", "source": ["Title"]},
+            {"cell_type": "markdown", "id": "m2", "source": []},
+        ]})
+        self.assertEqual(
+            "Jupyter notebook v4.5\n"
+            "└─▶ Code Cell #c1\n"
+            "    ┌  x = 1\n"
+            "    |  y = 2\n"
+            "    └  print(x + y) \n"
+            "└─▶ Markdown Cell #m1\n"
+            "    |  Title \n"
+            "└─▶ Markdown Cell #m2\n"
+            , Outliner(nb).outline())
+
 if __name__ == "__main__":
     unittest.main()